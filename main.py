@@ -1,12 +1,18 @@
 import csv
+import heapq
 import io
 import json
+import mmap
 import os
 import queue
+import re
 import subprocess
 import sys
 import threading
 import tkinter as tk
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, chain
 from tkinter import filedialog, font as tkfont, messagebox, ttk
 
 
@@ -61,6 +67,371 @@ def scan_for_match(
     return None
 
 
+def split_rows(lines, delimiter):
+    """
+    Yield csv rows from an iterator of physical lines. Lines without a quote
+    can't contain quoting or an embedded newline, so str.split gives the same
+    fields as csv.reader at a fraction of the cost; a line with a quote goes
+    to csv.reader, which pulls any continuation lines from the same iterator.
+    """
+    for line in lines:
+        if '"' in line:
+            yield next(csv.reader(chain((line,), lines), delimiter=delimiter))
+        else:
+            line = line.rstrip("\r\n")
+            # csv.reader yields [] (not [""]) for a blank line
+            yield line.split(delimiter) if line else []
+
+
+def _split_block(text, delimiter):
+    """
+    Rows of a block of whole lines. Quote-free text (with no bare CR, which
+    csv.reader treats as a line break) is split in bulk; anything else goes
+    through csv.reader.
+    """
+    if '"' not in text:
+        plain = text.replace("\r\n", "\n") if "\r" in text else text
+        if "\r" not in plain:
+            lines = plain.split("\n")
+            if not lines[-1]:
+                lines.pop()
+            return [line.split(delimiter) if line else [] for line in lines]
+    return list(csv.reader(io.StringIO(text, newline=""), delimiter=delimiter))
+
+
+def read_page(path, encoding, delimiter, offset, page_size, header_len,
+              end_offset=None):
+    """
+    Read up to page_size rows starting at byte offset, each padded to
+    header_len. Returns (rows, next_offset, has_more), where next_offset is the
+    byte offset just past the last row read (None if fewer than page_size rows
+    were read) and has_more says whether another row follows.
+
+    If end_offset (the start of the following page) is known, the page's bytes
+    are read and split in one block instead of going through a per-line tell()
+    generator. Either way quote-free lines skip csv.reader (see split_rows).
+
+    Pure function so the next page can be prefetched on a worker thread.
+    """
+    # Well-formed rows are used as-is; only short rows get a padded copy
+    pad = [""] * header_len
+    if end_offset is not None:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(end_offset - offset)
+        text = data.decode(encoding, errors="replace")
+        rows = _split_block(text, delimiter)
+        if len(rows) == page_size:
+            rows = [
+                row if len(row) >= header_len else row + pad[len(row):]
+                for row in rows
+            ]
+            return rows, end_offset, True
+        # Boundaries disagree with csv.reader (malformed file): read line by line
+
+    with open(path, "r", newline="", encoding=encoding, errors="replace") as f:
+        f.seek(offset)
+        pos = [offset]
+
+        def lines():
+            # readline() keeps tell() accurate (the file iterator does not)
+            readline = f.readline
+            tell = f.tell
+            while True:
+                line = readline()
+                if not line:
+                    return
+                pos[0] = tell()
+                yield line
+
+        rows = []
+        append = rows.append
+        next_offset = None
+        for row in split_rows(lines(), delimiter):
+            if len(rows) == page_size:
+                return rows, next_offset, True
+            append(row if len(row) >= header_len else row + pad[len(row):])
+            if len(rows) == page_size:
+                next_offset = pos[0]
+    return rows, next_offset, False
+
+
+def guess_delimiter(lines, candidates):
+    """
+    Fallback for when csv.Sniffer gives up: return the candidate that splits
+    at least 90% of the lines (and at least two) into the same nonzero number
+    of fields, preferring the most consistent and then the most frequent, or
+    None. Space needs an exact count on every line of at least five, since
+    any line of prose contains spaces.
+    """
+    best = None
+    best_score = None
+    for delim in candidates:
+        counts = [line.count(delim) for line in lines]
+        if len(counts) < 2:
+            continue
+        count, agreeing = Counter(counts).most_common(1)[0]
+        if delim == " ":
+            consistent = agreeing == len(counts) >= 5
+        else:
+            consistent = agreeing >= 0.9 * len(counts)
+        if not count or not consistent:
+            continue
+        score = (agreeing, count)
+        if best_score is None or score > best_score:
+            best, best_score = delim, score
+    return best
+
+
+def compile_row_builder(visible_columns):
+    """
+    Return a function mapping [(abs_idx, full_row), ...] to treeview values
+    [abs_idx + 1, full_row[i], ...] for the given column indices. The indices
+    are inlined into generated source, so each row is one list display with
+    no per-cell loop, lookup, or tuple unpacking.
+    """
+    cells = "".join(f", row[{int(i)}]" for i in visible_columns)
+    source = (
+        "def build(rows):\n"
+        f"    return [[abs_idx + 1{cells}] for abs_idx, row in rows]\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["build"]
+
+
+# Parser states for _advance_quote_state (mirrors the C csv module's states)
+_START_FIELD, _IN_FIELD, _IN_QUOTED, _QUOTE_IN_QUOTED = range(4)
+_QUOTE = ord('"')
+
+
+def _advance_quote_state(line, state, delim):
+    """
+    Run csv's field state machine over the bytes of one physical line and
+    return the state at its end. A record ends at the newline unless the state
+    is _IN_QUOTED (the newline is part of a quoted field).
+    """
+    for byte in line:
+        if state == _IN_QUOTED:
+            if byte == _QUOTE:
+                state = _QUOTE_IN_QUOTED
+        elif state == _QUOTE_IN_QUOTED:
+            # A doubled quote is an escaped quote; anything else closes the field
+            if byte == _QUOTE:
+                state = _IN_QUOTED
+            elif byte == delim:
+                state = _START_FIELD
+            else:
+                state = _IN_FIELD
+        elif state == _START_FIELD:
+            if byte == _QUOTE:
+                state = _IN_QUOTED
+            elif byte != delim:
+                state = _IN_FIELD
+        elif byte == delim:
+            state = _START_FIELD
+    return state
+
+
+def _record_patterns(delimiter):
+    """
+    Compiled patterns for whole records that need no state machine: every
+    field is either unquoted without a quote, or quoted (with "" escapes)
+    from its first byte to a delimiter or the line end, and no quoted field
+    holds a newline. Returns (one_line, lines) for fullmatch against a single
+    line without its newline, and against a run of newline-ended lines.
+    Starting from _START_FIELD, a match means csv.reader ends a record at
+    every newline, exactly as _advance_quote_state would find.
+    """
+    delim = re.escape(delimiter.encode())
+    quoted = rb'"[^"\n]*(?:""[^"\n]*)*"'
+    plain = rb'[^"\r\n' + delim + rb']*'  # \r only at the end, or this backtracks
+    field = rb"(?:" + quoted + rb"|" + plain + rb")"
+    record = field + rb"(?:" + delim + field + rb")*\r?"
+    return re.compile(record), re.compile(rb"(?:" + record + rb"\n)*")
+
+
+def _advance_plain(tail, state, delim):
+    """_advance_quote_state for a quote-free, newline-free tail of bytes."""
+    if not tail or state == _IN_QUOTED:
+        return state
+    return _START_FIELD if tail[-1] == delim else _IN_FIELD
+
+
+INDEX_CHUNK = 1 << 20  # Bytes scanned per step by build_page_index
+PARALLEL_INDEX_MIN = 64 << 20  # Smaller files are indexed on one thread
+
+
+def _plain_boundaries(lines, base, rows, page_size, filesize, offsets):
+    """
+    Append the page boundaries among quote-free lines (split on newlines,
+    the first starting at byte base) to offsets, where rows is the data-row
+    count before them. Every newline ends a record, so the positions come
+    from accumulated line lengths and Python only visits one line per page.
+    """
+    first = (-rows - 1) % page_size  # index of the next boundary line
+    if first < len(lines):
+        ends = list(accumulate(map(len, lines)))
+        for i in range(first, len(lines), page_size):
+            end = base + ends[i] + i + 1
+            if end < filesize:
+                offsets.append(end)
+
+
+def _segment_chunks(path, start, end, cancel_event):
+    """
+    Yield (base, bytes) blocks covering [start, end). Each segment reads with
+    its own handle: blocking reads release the GIL, so segments on worker
+    threads overlap their I/O (mmap page faults would not).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        for base in range(start, end, INDEX_CHUNK):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield base, f.read(min(INDEX_CHUNK, end - base))
+
+
+def _count_segment(path, start, end, cancel_event):
+    """Return (newline count, whether a quote byte occurs) for [start, end)."""
+    count = 0
+    quoted = False
+    for _, chunk in _segment_chunks(path, start, end, cancel_event):
+        count += chunk.count(b"\n")
+        quoted = quoted or b'"' in chunk
+    return count, quoted
+
+
+def _index_segment(path, start, end, rows, page_size, filesize, cancel_event):
+    """Page boundaries in a quote-free [start, end) preceded by `rows` data rows."""
+    offsets = []
+    for base, chunk in _segment_chunks(path, start, end, cancel_event):
+        lines = chunk.split(b"\n")
+        lines.pop()  # a partial line's end is counted in the next block
+        _plain_boundaries(lines, base, rows, page_size, filesize, offsets)
+        rows += len(lines)
+    return offsets
+
+
+def _build_page_index_parallel(path, has_header, page_size, filesize, workers,
+                               cancel_event):
+    """
+    build_page_index for quote-free files, split into newline-aligned
+    segments scanned on `workers` threads: one pass counts each segment's
+    rows, the running totals give every segment its first row number, and a
+    second pass records the boundaries. Returns None if the file contains a
+    quote (a quoted newline makes row starts depend on everything before
+    them, so only the serial scan can find them) or has no newline at all.
+    """
+    starts = {0}
+    with open(path, "rb") as f:
+        for k in range(1, workers):
+            f.seek(k * filesize // workers)
+            f.readline()  # snap forward to the start of the next line
+            starts.add(f.tell())
+    bounds = sorted(starts) + [filesize]
+    segments = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+    with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+        counts = list(pool.map(
+            lambda seg: _count_segment(path, seg[0], seg[1], cancel_event), segments
+        ))
+        if (
+            any(quoted for _, quoted in counts)
+            or sum(n for n, _ in counts) == 0
+            or (cancel_event is not None and cancel_event.is_set())
+        ):
+            return None
+        rows = -1 if has_header else 0
+        futures = []
+        for (start, end), (newlines, _) in zip(segments, counts):
+            futures.append(pool.submit(
+                _index_segment, path, start, end, rows, page_size, filesize,
+                cancel_event,
+            ))
+            rows += newlines
+        offsets = [] if has_header else [0]
+        for future in futures:
+            offsets.extend(future.result())
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    return offsets
+
+
+def build_page_index(path, delimiter, has_header, page_size, cancel_event=None):
+    """
+    Scan the file once and return a list whose item p is the byte offset of
+    the first data row of page p, or None if the file can't be indexed
+    (bare-CR line endings) or cancel_event fires mid-scan.
+
+    csv doesn't expose byte offsets, so record boundaries are found by hand.
+    Large quote-free files are scanned in parallel segments. Otherwise the
+    file is walked a chunk at a time over an mmap: chunks without a quote
+    byte (the usual case), or whose quotes all wrap whole single-line fields
+    (exporters that quote every field), are split on newlines in C. Other
+    lines go through the same field state machine csv.reader uses, so a
+    newline inside a quoted field never counts as a row break.
+    """
+    delim = ord(delimiter)
+    filesize = os.path.getsize(path)
+    offsets = []
+    rows = -1 if has_header else 0  # the header record doesn't count as data
+    if not has_header:
+        offsets.append(0)
+    if filesize == 0:
+        return offsets
+
+    workers = min(os.cpu_count() or 1, 8)
+    if filesize >= PARALLEL_INDEX_MIN and workers > 1:
+        parallel = _build_page_index_parallel(
+            path, has_header, page_size, filesize, workers, cancel_event
+        )
+        if parallel is not None:
+            return parallel
+
+    state = _START_FIELD
+    quoted_line, quoted_lines = _record_patterns(delimiter)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b"\n") == -1 and mm.find(b"\r") != -1:
+            return None  # bare-CR file: rows can't be split on newlines
+        for base in range(0, filesize, INDEX_CHUNK):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            chunk = mm[base:base + INDEX_CHUNK]
+            lines = chunk.split(b"\n")
+            tail = lines.pop()  # bytes after the last newline (may be partial)
+
+            if (state != _IN_QUOTED and b'"' not in chunk) or (
+                state == _START_FIELD
+                and quoted_lines.fullmatch(chunk, 0, len(chunk) - len(tail))
+            ):
+                # Fast path: every newline ends a record
+                _plain_boundaries(lines, base, rows, page_size, filesize, offsets)
+                rows += len(lines)
+                if lines:
+                    state = _START_FIELD
+            else:
+                pos = base
+                for line in lines:
+                    pos += len(line) + 1
+                    if (state == _IN_QUOTED or b'"' in line) and not (
+                        state == _START_FIELD and quoted_line.fullmatch(line)
+                    ):
+                        state = _advance_quote_state(line, state, delim)
+                        if state == _IN_QUOTED:
+                            continue  # newline inside a quoted field
+                    state = _START_FIELD
+                    rows += 1
+                    if rows % page_size == 0 and pos < filesize:
+                        offsets.append(pos)
+
+            if b'"' in tail:
+                state = _advance_quote_state(tail, state, delim)
+            else:
+                state = _advance_plain(tail, state, delim)
+    return offsets
+
+
 class LazyCSVViewerGUI:
     """
     A simple CSV viewer application that loads and displays CSV files page by page.
@@ -68,6 +439,16 @@ class LazyCSVViewerGUI:
     """
 
     ROWNUM_ID = "rownum"  # Column id for the synthetic row-number column
+    ROW_WINDOW = 500  # Max rows in the treeview at once; bigger pages are windowed
+    # Tcl proc that fills a treeview from a flat [iid values tag ...] list, so
+    # a window of rows goes in with one Python -> Tcl call instead of one each
+    TREE_FILL_PROC = (
+        "proc lazy_csv_viewer_fill {tree items} {\n"
+        "    foreach {iid values tag} $items {\n"
+        "        $tree insert {} end -id $iid -values $values -tags $tag\n"
+        "    }\n"
+        "}"
+    )
 
     def __init__(self, root: tk.Tk):
         """
@@ -91,6 +472,7 @@ class LazyCSVViewerGUI:
         self.total_rows = None  # Estimated/exact total data rows (None = unknown)
         self.total_is_estimate = False  # True when total_rows is a sample estimate
         self.scroll_speed = 20  # Controls how fast horizontal scrolling moves
+        self._pending_xview = None  # Coalesced mousewheel target, applied when idle
         self.delimiter = ","  # Default delimiter (comma)
         self.encoding = "utf-8"  # Detected per-file when a file is opened
         self.has_header = True  # False => treat row 1 as data, synth column names
@@ -98,6 +480,16 @@ class LazyCSVViewerGUI:
         self.hidden_columns = set()  # Track hidden columns
         self.column_headers = []  # Store column headers for reference
         self._page_full_rows = []  # Full (unfiltered-columns) rows for the detail view
+        self._page_rows = []  # (abs_idx, full_row) for every row of the page
+        self._visible_columns = []  # Indices of the columns shown in the treeview
+        self._row_builder = None  # compile_row_builder() for _visible_columns
+        self._window_start = 0  # Page position of the first row in the treeview
+        self._recenter_pending = False
+        self._last_header = None  # (columns, header) last set up in the treeview
+        self._last_page_key = None  # _page_key() of what the treeview now shows
+        self._applied_widths = {}  # column id -> (width, stretch) last applied
+        self._width_sample = None  # (columns, header, sample rows) of the shown page
+        self._delimiter_reload = None  # Pending debounced reload (after() id)
         self.delimiter_options = [
             (",", "Comma (,)"),
             ("\t", "Tab (\\t)"),
@@ -126,6 +518,22 @@ class LazyCSVViewerGUI:
         self._count_queue = queue.Queue()
         self._count_token = 0
 
+        # Shared worker pool for file reads the UI kicks off on every open and
+        # page turn (page index, next-page prefetch), so those don't each spawn
+        # a thread. Two workers: a long index build never blocks a prefetch.
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+
+        # Background page index: one binary scan that fills in page_offsets so
+        # any page (not just visited ones) can be reached with a single seek()
+        self._index_queue = queue.Queue()
+        self._index_token = 0
+        self._index_cancel = threading.Event()
+        self._index_future = None
+
+        # Next-page prefetch: while page N is shown, page N+1 is parsed on a
+        # worker. Keyed by (page, byte offset, delimiter) -> Future of read_page
+        self._prefetch = {}
+
         # Live appearance tracking (re-theme on macOS dark/light toggle)
         self._dark_mode = False
 
@@ -162,6 +570,7 @@ class LazyCSVViewerGUI:
             except tk.TclError:
                 pass
         self.root.after(300, self._poll_count_queue)
+        self.root.after(300, self._poll_index_queue)
         self.root.after(150, self._poll_search_queue)
         self.root.after(3000, self._poll_appearance)
 
@@ -211,6 +620,11 @@ class LazyCSVViewerGUI:
     def _on_close(self):
         """Save settings, then close the window."""
         self._save_config()
+        # Pool workers are joined at interpreter exit, so stop the index scan
+        # rather than let it hold the process open
+        self._cancel_index()
+        self._clear_prefetch()
+        self._io_pool.shutdown(wait=False)
         self.root.destroy()
 
     def _apply_initial_geometry(self):
@@ -256,8 +670,8 @@ class LazyCSVViewerGUI:
     def _apply_theme(self):
         """
         Choose row/text colors based on the OS appearance and apply them to the
-        Treeview style. Row tag colors are stored on self for use when rows are
-        inserted in _display().
+        Treeview style. Row tag colors are stored on self and applied to the
+        row tags by _configure_row_tags().
         """
         self._dark_mode = self._detect_dark_mode()
         if self._dark_mode:
@@ -287,24 +701,46 @@ class LazyCSVViewerGUI:
             foreground=[("selected", "#FFFFFF")],
         )
 
+    def _configure_row_tags(self):
+        """Apply the striped row colors to the tags _display() inserts with."""
+        self.tree.tag_configure(
+            "even", background=self.odd_row_color, foreground=self.row_text_color
+        )
+        self.tree.tag_configure(
+            "odd", background=self.even_row_color, foreground=self.row_text_color
+        )
+
     def _poll_appearance(self):
         """Re-theme if the macOS appearance changed since the last check."""
         if self._detect_dark_mode() != self._dark_mode:
             self._apply_theme()
-            if self.file_path:
-                self._load_page()  # re-render so row tags pick up the new colors
+            self._configure_row_tags()  # existing rows pick up the new colors
         self.root.after(3000, self._poll_appearance)
 
     # ----------------------------------------------------------- scroll helpers
 
     def on_horizontal_mousewheel(self, event):
-        """Handle horizontal scrolling with the mousewheel when Shift is pressed."""
+        """
+        Handle horizontal scrolling with the mousewheel when Shift is pressed.
+        Trackpads fire dozens of events a second, so deltas are accumulated
+        and applied in one xview_moveto when Tk next goes idle.
+        """
         direction = -1 if event.delta > 0 else 1
         amount = direction * (self.scroll_speed / 1000)
-        current = self.tree.xview()[0]
-        self.tree.xview_moveto(max(0, min(1, current + amount)))
+        if self._pending_xview is None:
+            current = self.tree.xview()[0]
+            self.root.after_idle(self._flush_xview)
+        else:
+            current = self._pending_xview
+        self._pending_xview = max(0, min(1, current + amount))
         return "break"
 
+    def _flush_xview(self):
+        """Apply the coalesced mousewheel scroll position."""
+        if self._pending_xview is not None:
+            self.tree.xview_moveto(self._pending_xview)
+            self._pending_xview = None
+
     def scroll_horizontal(self, units):
         """Scroll the treeview horizontally by the specified number of units."""
         amount = units * (self.scroll_speed / 100)
@@ -423,7 +859,7 @@ class LazyCSVViewerGUI:
         self.tree = ttk.Treeview(self.frame, show="headings")
         self.tree.grid(row=2, column=0, columnspan=2, sticky="nsew")
         self.scrollbar = ttk.Scrollbar(
-            self.frame, orient="vertical", command=self.tree.yview
+            self.frame, orient="vertical", command=self._on_yscrollbar
         )
         self.scrollbar.grid(row=2, column=2, sticky="ns")
         self.xscrollbar = ttk.Scrollbar(
@@ -431,8 +867,14 @@ class LazyCSVViewerGUI:
         )
         self.xscrollbar.grid(row=3, column=0, columnspan=2, sticky="ew")
         self.tree.configure(
-            yscrollcommand=self.scrollbar.set, xscrollcommand=self.xscrollbar.set
+            yscrollcommand=self._on_tree_yscroll, xscrollcommand=self.xscrollbar.set
         )
+        self._configure_row_tags()
+        try:
+            self.tree.tk.eval(self.TREE_FILL_PROC)
+            self._bulk_fill = True
+        except tk.TclError:
+            self._bulk_fill = False
 
         # --- Navigation -------------------------------------------------------
         self.prev_button = ttk.Button(
@@ -545,11 +987,11 @@ class LazyCSVViewerGUI:
         i = self._display_col_index(self._ctx_col)
         if i < 0:
             return
-        column = []
-        for item in self.tree.get_children():
-            values = self.tree.item(item, "values")
-            if i < len(values):
-                column.append(str(values[i]))
+        column = [
+            str(values[i])
+            for values in self._display_values(0, len(self._page_rows))
+            if i < len(values)
+        ]
         self._set_clipboard("\n".join(column))
 
     # ------------------------------------------------------------ detail view
@@ -566,9 +1008,8 @@ class LazyCSVViewerGUI:
             item = sel[0] if sel else None
         if not item:
             return
-        children = self.tree.get_children()
         try:
-            pos = children.index(item)
+            pos = int(item)  # items are inserted with their page position as iid
         except ValueError:
             return
         if pos >= len(self._page_full_rows):
@@ -629,15 +1070,37 @@ class LazyCSVViewerGUI:
 
     def _on_delimiter_changed(self, event=None):
         """Handle the delimiter selection change event."""
+        previous = self.delimiter
         selected_display = self.delimiter_dropdown.get()
         for delim, display in self.delimiter_options:
             if display == selected_display:
                 self.delimiter = delim
                 break
-        # Row boundaries don't depend on the delimiter, so cached offsets stay valid
-        if self.file_path:
+        if self.file_path and self.delimiter != previous:
+            # A quoted field can only span lines if its quote opens the field,
+            # which depends on the delimiter, so page boundaries and filter
+            # matches move with it. Drop them now rather than after the
+            # debounce, so a page turn in between can't reuse them.
+            self.page_offsets = {}
+            self._clear_prefetch()
             self._reset_filter_index()
+            self._cancel_index()
+        # Debounced: flicking through options only re-reads for the last one
+        if self._delimiter_reload is not None:
+            self.root.after_cancel(self._delimiter_reload)
+        self._delimiter_reload = self.root.after(250, self._reload_for_delimiter)
+
+    def _reload_for_delimiter(self):
+        """
+        Re-render and re-index after a delimiter change (the debounced part).
+        The render is skipped if the page on screen already matches, e.g. the
+        user flicked away and back to the same delimiter.
+        """
+        self._delimiter_reload = None
+        if self.file_path:
             self._load_page()
+            if self._index_future is None:  # cancelled by _on_delimiter_changed
+                self._start_index()
 
     def _on_page_size_changed(self):
         """Handle the page size change event."""
@@ -647,10 +1110,12 @@ class LazyCSVViewerGUI:
                 self.page_size = new_page_size
                 self.current_page = 0
                 self.page_offsets = {}  # Boundaries depend on page size
+                self._clear_prefetch()
                 self._reset_filter_index()
                 self._save_config()  # persist immediately, regardless of quit method
                 if self.file_path:
                     self._load_page()
+                    self._start_index()
             else:
                 messagebox.showerror("Error", "Page size must be a positive integer.")
         except ValueError:
@@ -662,8 +1127,9 @@ class LazyCSVViewerGUI:
         self.expand_columns_button.config(
             text="Collapse Columns" if self.expand_columns else "Expand Columns"
         )
-        if self.file_path:
-            self._load_page()
+        # Widths only depend on the rows already shown; re-size, don't re-read
+        if self.file_path and self._width_sample is not None:
+            self._apply_column_widths(*self._width_sample)
 
     def toggle_header(self):
         """Switch between 'first row is a header' and 'first row is data'."""
@@ -673,11 +1139,14 @@ class LazyCSVViewerGUI:
         self._count_token += 1
         self.current_page = 0
         self.page_offsets = {}
+        self._clear_prefetch()
+        self._last_page_key = None
         self._reset_filter_index()
         self.total_rows, self.total_is_estimate = self._estimate_total_rows(
             self.file_path
         )
         self._load_page()
+        self._start_index()
         if self.total_is_estimate:
             self._start_count(
                 self.file_path, self.encoding, self.delimiter, self.has_header,
@@ -771,11 +1240,14 @@ class LazyCSVViewerGUI:
             return
         self._count_token += 1
         self.page_offsets = {}
+        self._clear_prefetch()
+        self._last_page_key = None
         self._reset_filter_index()
         self.total_rows, self.total_is_estimate = self._estimate_total_rows(
             self.file_path
         )
         self._load_page()
+        self._start_index()
         if self.total_is_estimate:
             self._start_count(
                 self.file_path, self.encoding, self.delimiter, self.has_header,
@@ -801,6 +1273,8 @@ class LazyCSVViewerGUI:
         self.current_page = 0
         self.hidden_columns.clear()
         self.page_offsets = {}
+        self._clear_prefetch()
+        self._last_page_key = None
         self._search_query = None
         self._last_match_row = -1
         self._reset_filter_index()
@@ -814,6 +1288,7 @@ class LazyCSVViewerGUI:
         self._add_recent(path)
         self._save_config()  # persist recent files/last dir even if force-quit
         self._load_page()
+        self._start_index()
 
         if self.total_is_estimate:
             self._start_count(
@@ -887,14 +1362,28 @@ class LazyCSVViewerGUI:
         return "latin-1"
 
     def _auto_detect_delimiter(self, path, encoding):
-        """Sniff the delimiter from a sample and sync self.delimiter + dropdown."""
+        """
+        Sniff the delimiter from a 64 KB sample and sync self.delimiter +
+        dropdown. Space is left out of the sniff (prose in quoted fields would
+        win too often) but is considered by the per-line consistency fallback.
+        """
         try:
-            with open(path, "r", newline="", encoding=encoding) as f:
-                sample = f.read(8192)
-            dialect = csv.Sniffer().sniff(sample, delimiters=",\t;|")
-            detected = dialect.delimiter
-        except (csv.Error, OSError):
+            with open(path, "r", newline="", encoding=encoding,
+                      errors="replace") as f:
+                sample = f.read(65536)
+        except OSError:
             return
+        lines = sample.splitlines()
+        if len(sample) == 65536 and len(lines) > 1:
+            lines.pop()  # the last line is probably cut off mid-row
+            sample = "\n".join(lines)
+        try:
+            detected = csv.Sniffer().sniff(sample, delimiters=",\t;|").delimiter
+        except csv.Error:
+            detected = guess_delimiter(
+                [line for line in lines if line],
+                [d for d, _ in self.delimiter_options],
+            )
 
         for index, (delim, _) in enumerate(self.delimiter_options):
             if delim == detected:
@@ -933,12 +1422,60 @@ class LazyCSVViewerGUI:
                     self.total_is_estimate = False
                     if self.file_path and not self.filter_active:
                         self.page_label.config(
-                            text=self._page_label_text(len(self.tree.get_children()))
+                            text=self._page_label_text(len(self._page_full_rows))
                         )
         except queue.Empty:
             pass
         self.root.after(300, self._poll_count_queue)
 
+    # ------------------------------------------------------- background index
+
+    def _start_index(self):
+        """
+        (Re)build the page index for the current file on the I/O pool. Any
+        in-flight build is cancelled, since its offsets depend on the delimiter,
+        header mode, and page size it was started with.
+        """
+        self._cancel_index()
+        if not self.file_path:
+            return
+        self._index_cancel = threading.Event()
+        self._index_future = self._io_pool.submit(
+            self._build_index_worker,
+            self.file_path, self.delimiter, self.has_header, self.page_size,
+            self._index_cancel, self._index_token,
+        )
+
+    def _cancel_index(self):
+        """Stop any in-flight index build and drop its pending result."""
+        self._index_token += 1
+        self._index_cancel.set()
+        if self._index_future is not None:
+            self._index_future.cancel()
+            self._index_future = None
+
+    def _build_index_worker(self, path, delimiter, has_header, page_size, cancel,
+                            token):
+        """Build the page index (off the UI thread); post the result on a queue."""
+        try:
+            offsets = build_page_index(path, delimiter, has_header, page_size, cancel)
+        except OSError:
+            return
+        if offsets is not None:
+            self._index_queue.put((token, offsets))
+
+    def _poll_index_queue(self):
+        """Merge a finished page index for the current file, then reschedule."""
+        try:
+            while True:
+                token, offsets = self._index_queue.get_nowait()
+                if token == self._index_token:
+                    for page, offset in enumerate(offsets):
+                        self.page_offsets.setdefault(page, offset)
+        except queue.Empty:
+            pass
+        self.root.after(300, self._poll_index_queue)
+
     # --------------------------------------------------------------- paging
 
     def _load_page(self):
@@ -948,11 +1485,15 @@ class LazyCSVViewerGUI:
         """
         if not self.file_path:
             return
+        key = self._page_key()
+        if key == self._last_page_key:
+            return  # the treeview already shows exactly this page
         try:
             if self.filter_active:
                 self._render_filter_page()
             else:
                 self._render_page()
+            self._last_page_key = key
         except StopIteration:
             messagebox.showerror("Empty file", "This file has no data to display.")
             self._reset_view()
@@ -960,6 +1501,18 @@ class LazyCSVViewerGUI:
             messagebox.showerror("Error", f"Could not read the file:\n{exc}")
             self._reset_view()
 
+    def _page_key(self):
+        """
+        Everything the rendered page depends on. Changes that alter it without
+        showing up here (reloading, re-opening, header mode) clear
+        _last_page_key themselves.
+        """
+        return (
+            self.file_path, self.current_page, self.delimiter,
+            frozenset(self.hidden_columns), self.page_size,
+            self.filter_query if self.filter_active else None,
+        )
+
     def _row_iter(self, f):
         """
         Yield lines from f while recording the byte offset after each line in
@@ -967,11 +1520,13 @@ class LazyCSVViewerGUI:
         is the start of the next row. readline() keeps tell() accurate (the
         read-ahead file iterator does not).
         """
+        readline = f.readline
+        tell = f.tell
         while True:
-            line = f.readline()
+            line = readline()
             if not line:
                 return
-            self._byte_pos = f.tell()
+            self._byte_pos = tell()
             yield line
 
     def _read_header_and_seek(self, f):
@@ -998,49 +1553,93 @@ class LazyCSVViewerGUI:
         return header, reader
 
     def _render_page(self):
-        """Render the current (unfiltered) page using cached byte offsets."""
-        with open(self.file_path, "r", newline="", encoding=self.encoding,
-                  errors="replace") as f:
-            header, reader = self._read_header_and_seek(f)
-
-            if self.current_page in self.page_offsets:
-                offset = self.page_offsets[self.current_page]
-                f.seek(offset)
-                self._byte_pos = offset
-                reader = csv.reader(self._row_iter(f), delimiter=self.delimiter)
-            else:
-                skipped = 0
-                for _ in range(self.current_page * self.page_size):
-                    try:
-                        next(reader)
-                    except StopIteration:
-                        break
-                    skipped += 1
-                    if skipped % self.page_size == 0:
-                        self.page_offsets.setdefault(
-                            skipped // self.page_size, self._byte_pos
-                        )
-
-            row_base = self.current_page * self.page_size
-            rows = []
-            next_page_offset = None
-            self.has_next_page = False
-            count = 0
-            for row in reader:
-                if count < self.page_size:
-                    padded = row + [""] * (len(header) - len(row))
-                    rows.append((row_base + count, padded))
-                    count += 1
-                    if count == self.page_size:
-                        next_page_offset = self._byte_pos
-                else:
-                    self.has_next_page = True
-                    break
+        """
+        Render the current (unfiltered) page, using the prefetched rows if the
+        worker already parsed it, otherwise reading via cached byte offsets.
+        """
+        prefetched = self._take_prefetched(self.current_page)
+        if prefetched is not None:
+            header = self.column_headers
+            page_rows, next_page_offset, self.has_next_page = prefetched
+        else:
+            with open(self.file_path, "r", newline="", encoding=self.encoding,
+                      errors="replace") as f:
+                header, reader = self._read_header_and_seek(f)
+
+                # Seek to the nearest known page at/before this one (the exact
+                # page once the background index is built) and skip only the
+                # remainder.
+                base_page = max(p for p in self.page_offsets if p <= self.current_page)
+                offset = self.page_offsets[base_page]
+                if base_page < self.current_page:
+                    f.seek(offset)
+                    self._byte_pos = offset
+                    reader = csv.reader(self._row_iter(f), delimiter=self.delimiter)
+                    skipped = 0
+                    page_size = self.page_size
+                    remember = self.page_offsets.setdefault
+                    for _ in range((self.current_page - base_page) * page_size):
+                        try:
+                            next(reader)
+                        except StopIteration:
+                            break
+                        skipped += 1
+                        if skipped % page_size == 0:
+                            remember(base_page + skipped // page_size, self._byte_pos)
+                    offset = self._byte_pos
+
+            page_rows, next_page_offset, self.has_next_page = read_page(
+                self.file_path, self.encoding, self.delimiter, offset,
+                self.page_size, len(header),
+                self.page_offsets.get(self.current_page + 1),
+            )
 
-            if self.has_next_page and next_page_offset is not None:
-                self.page_offsets[self.current_page + 1] = next_page_offset
+        if self.has_next_page and next_page_offset is not None:
+            self.page_offsets[self.current_page + 1] = next_page_offset
 
+        row_base = self.current_page * self.page_size
+        rows = [(row_base + i, row) for i, row in enumerate(page_rows)]
         self._display(header, rows)
+        self._schedule_prefetch()
+
+    def _prefetch_key(self, page):
+        """Cache key for a page: its byte offset pins it to the current layout."""
+        return (page, self.page_offsets.get(page), self.delimiter)
+
+    def _take_prefetched(self, page):
+        """
+        Return the prefetched read_page result for page, or None if it wasn't
+        prefetched or the worker failed (the caller then reads it directly and
+        surfaces any error itself). Waits if the worker is still mid-parse,
+        since that is never slower than starting over.
+        """
+        future = self._prefetch.pop(self._prefetch_key(page), None)
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result()
+        except (OSError, UnicodeDecodeError, csv.Error):
+            return None
+
+    def _schedule_prefetch(self):
+        """Start parsing the page after the current one; drop every other entry."""
+        page = self.current_page + 1
+        key = self._prefetch_key(page)
+        for stale in [k for k in self._prefetch if k != key]:
+            self._prefetch.pop(stale).cancel()
+        if not self.has_next_page or key[1] is None or key in self._prefetch:
+            return
+        self._prefetch[key] = self._io_pool.submit(
+            read_page, self.file_path, self.encoding, self.delimiter, key[1],
+            self.page_size, len(self.column_headers),
+            self.page_offsets.get(page + 1),
+        )
+
+    def _clear_prefetch(self):
+        """Discard all prefetched pages (the file or its page layout changed)."""
+        for future in self._prefetch.values():
+            future.cancel()
+        self._prefetch = {}
 
     def _render_filter_page(self):
         """Render a page of only the rows matching the active filter."""
@@ -1081,12 +1680,17 @@ class LazyCSVViewerGUI:
                     self.page_offsets.setdefault(0, self._byte_pos)
                     idx = 0
 
+                # Locals, not attribute lookups, inside the per-row loop
                 header_len = len(self.column_headers)
+                pad = [""] * header_len
+                query = self.filter_query
+                matches = self.filter_matches
+                add_match = matches.append
                 for row in reader:
-                    if any(self.filter_query in cell.lower() for cell in row):
-                        padded = row + [""] * (header_len - len(row))
-                        self.filter_matches.append((idx, padded))
-                        if len(self.filter_matches) >= needed:
+                    if any(query in cell.lower() for cell in row):
+                        padded = row if len(row) >= header_len else row + pad[len(row):]
+                        add_match((idx, padded))
+                        if len(matches) >= needed:
                             self.filter_scan_offset = self._byte_pos
                             self.filter_scan_idx = idx + 1
                             return
@@ -1111,41 +1715,143 @@ class LazyCSVViewerGUI:
         page indicator. Shared by the normal and filtered render paths.
         """
         self.column_visibility_button.config(state="normal")
-        self.tree.delete(*self.tree.get_children())
 
         visible_columns = [
             i for i in range(len(header)) if i not in self.hidden_columns
         ]
         columns = [self.ROWNUM_ID] + visible_columns
-        self.tree["columns"] = columns
-        self.tree.heading(self.ROWNUM_ID, text="#")
-        self.tree.column(self.ROWNUM_ID, anchor="e", stretch=False)
-        for i in visible_columns:
-            self.tree.heading(i, text=str(header[i]))
-            self.tree.column(i, anchor="w")
-
-        self._page_full_rows = []
-        sample_rows = []
-        for position, (abs_idx, full_row) in enumerate(rows):
-            visible_row = [full_row[i] for i in visible_columns]
-            values = [abs_idx + 1] + visible_row
-            tag = "odd" if position % 2 else "even"
-            self.tree.insert("", "end", values=values, tags=(tag,))
-            self._page_full_rows.append(full_row)
-            if len(sample_rows) < 300:
-                sample_rows.append(values)
-
-        self.tree.tag_configure(
-            "even", background=self.odd_row_color, foreground=self.row_text_color
-        )
-        self.tree.tag_configure(
-            "odd", background=self.even_row_color, foreground=self.row_text_color
-        )
-        self._apply_column_widths(columns, header, sample_rows)
+        # Paging within a file keeps the same columns; only re-issue the
+        # per-column Tcl calls when the column set or header text changes.
+        if (columns, header) != self._last_header:
+            self.tree["columns"] = columns
+            self.tree.heading(self.ROWNUM_ID, text="#")
+            self.tree.column(self.ROWNUM_ID, anchor="e", stretch=False)
+            for i in visible_columns:
+                self.tree.heading(i, text=str(header[i]))
+                self.tree.column(i, anchor="w")
+            self._last_header = (columns, list(header))
+            self._row_builder = compile_row_builder(visible_columns)
+            self._applied_widths = {}
+
+        # Display values are only built for rows that reach the treeview (the
+        # window), not for the whole page.
+        self._page_rows = rows
+        self._visible_columns = visible_columns
+        self._page_full_rows = [full_row for _, full_row in rows]
+        self._insert_window(0)
+
+        self._width_sample = (columns, header, self._display_values(0, 300))
+        self._apply_column_widths(*self._width_sample)
 
         self.page_label.config(text=self._page_label_text(len(rows), filtered=filtered))
         self._update_nav_buttons()
 
+    def _insert_window(self, start):
+        """
+        Fill the treeview with page rows [start, start + ROW_WINDOW). Pages no
+        bigger than the window are inserted whole; bigger ones are scrolled
+        through by _on_tree_yscroll/_on_yscrollbar, so insert cost doesn't grow
+        with the page size. Each item's iid is its position on the page. Rows
+        go in through TREE_FILL_PROC in a single call when it's available.
+        """
+        self.tree.delete(*self.tree.get_children())
+        self._window_start = start
+        window = self._display_values(start, start + self.ROW_WINDOW)
+        if self._bulk_fill:
+            items = []
+            extend = items.extend
+            for position, values in enumerate(window, start):
+                extend((position, values, "odd" if position % 2 else "even"))
+            try:
+                self.tree.tk.call("lazy_csv_viewer_fill", str(self.tree), items)
+                return
+            except tk.TclError:
+                # Drop any partial fill and insert row by row instead
+                self.tree.delete(*self.tree.get_children())
+        insert = self.tree.insert
+        for position, values in enumerate(window, start):
+            insert(
+                "", "end", iid=str(position), values=values,
+                tags=("odd" if position % 2 else "even",),
+            )
+
+    def _display_values(self, start, stop):
+        """
+        Treeview values (row number + visible cells) for page rows
+        [start, stop). When the visible columns are a leading run (nothing
+        hidden, the usual case) a C-level slice replaces the per-column gather.
+        """
+        rows = self._page_rows[start:stop]
+        visible_columns = self._visible_columns
+        width = len(visible_columns)
+        if not visible_columns or visible_columns[-1] == width - 1:
+            return [[abs_idx + 1] + full_row[:width] for abs_idx, full_row in rows]
+        return self._row_builder(rows)
+
+    def _window_rows(self):
+        """Number of page rows currently in the treeview."""
+        return min(self.ROW_WINDOW, len(self._page_rows) - self._window_start)
+
+    def _move_window(self, top):
+        """
+        Re-window around page row `top`, keep it at the top of the view, and
+        carry the selection/focus over if those rows are still present.
+        """
+        total = len(self._page_rows)
+        start = max(0, min(total - self.ROW_WINDOW, int(top) - self.ROW_WINDOW // 2))
+        if start == self._window_start:
+            return
+        selection = self.tree.selection()
+        focus = self.tree.focus()
+        self._insert_window(start)
+        kept = [item for item in selection if self.tree.exists(item)]
+        if kept:
+            self.tree.selection_set(kept)
+        if focus and self.tree.exists(focus):
+            self.tree.focus(focus)
+        self.tree.yview_moveto((top - start) / self._window_rows())
+
+    def _on_tree_yscroll(self, first, last):
+        """
+        yscrollcommand proxy: map the treeview's window-relative position to
+        the whole page for the scrollbar, and slide the window once the view
+        nears either edge of it.
+        """
+        first, last = float(first), float(last)
+        total = len(self._page_rows)
+        shown = self._window_rows()
+        if total <= shown or shown <= 0:
+            self.scrollbar.set(first, last)
+            return
+        start = self._window_start
+        self.scrollbar.set(
+            (start + first * shown) / total, (start + last * shown) / total
+        )
+        near_top = first < 0.1 and start > 0
+        near_bottom = last > 0.9 and start + shown < total
+        if (near_top or near_bottom) and not self._recenter_pending:
+            self._recenter_pending = True
+            self.root.after_idle(self._recenter_window)
+
+    def _recenter_window(self):
+        """Slide the window so the rows in view sit in its middle."""
+        self._recenter_pending = False
+        shown = self._window_rows()
+        if len(self._page_rows) > shown > 0:
+            self._move_window(self._window_start + self.tree.yview()[0] * shown)
+
+    def _on_yscrollbar(self, *args):
+        """Scrollbar command proxy: drags address the whole page, not the window."""
+        total = len(self._page_rows)
+        shown = self._window_rows()
+        if total <= shown or shown <= 0 or args[0] != "moveto":
+            self.tree.yview(*args)
+            return
+        target = float(args[1]) * total
+        if not self._window_start <= target < self._window_start + shown:
+            self._move_window(target)
+        self.tree.yview_moveto((target - self._window_start) / self._window_rows())
+
     def _apply_column_widths(self, columns, header, sample_rows):
         """
         Size each column to fit its header and sampled cell content. Fit mode
@@ -1156,18 +1862,24 @@ class LazyCSVViewerGUI:
         pad = 24
         min_w = 50
         cap = 1200 if self.expand_columns else 360
+        applied = self._applied_widths
         for pos, colid in enumerate(columns):
-            cell_w = max((font.measure(str(r[pos])) for r in sample_rows), default=0)
+            # Each font.measure is a Tcl round-trip, so only the few longest
+            # distinct strings are measured (the widest is among them in
+            # practice) instead of every sampled cell.
+            longest = heapq.nlargest(5, {str(r[pos]) for r in sample_rows}, key=len)
+            cell_w = max(map(font.measure, longest), default=0)
             if colid == self.ROWNUM_ID:
                 content = max(font.measure("#"), cell_w)
-                self.tree.column(
-                    colid, width=min(160, max(40, content + pad)), stretch=False
-                )
-                continue
-            head_w = font.measure(str(header[colid]))
-            content = max(head_w, cell_w)
-            width = min(cap, max(min_w, content + pad))
-            self.tree.column(colid, width=width, stretch=not self.expand_columns)
+                setting = (min(160, max(40, content + pad)), False)
+            else:
+                head_w = font.measure(str(header[colid]))
+                content = max(head_w, cell_w)
+                setting = (min(cap, max(min_w, content + pad)), not self.expand_columns)
+            # Paging usually lands on the same widths; skip the unchanged ones
+            if applied.get(colid) != setting:
+                self.tree.column(colid, width=setting[0], stretch=setting[1])
+                applied[colid] = setting
 
     def _page_label_text(self, row_count, filtered=False):
         """Build the page indicator text for the current (filtered) page."""
@@ -1198,13 +1910,22 @@ class LazyCSVViewerGUI:
         """Clear the view back to an empty state after a failed load."""
         self.file_path = None
         self._count_token += 1
+        self._cancel_index()
         self.tree.delete(*self.tree.get_children())
         self.tree["columns"] = ()
+        self._last_header = None
+        self._last_page_key = None
+        self._applied_widths = {}
+        self._width_sample = None
         self.column_headers = []
         self._page_full_rows = []
+        self._page_rows = []
+        self._visible_columns = []
+        self._window_start = 0
         self.has_next_page = False
         self.current_page = 0
         self.page_offsets = {}
+        self._clear_prefetch()
         self.total_rows = None
         self.total_is_estimate = False
         self.filter_active = False
@@ -1257,9 +1978,12 @@ class LazyCSVViewerGUI:
 
     def _select_row_in_view(self, local_index):
         """Select, focus, and scroll to a row by its position on the current page."""
-        children = self.tree.get_children()
-        if 0 <= local_index < len(children):
-            item = children[local_index]
+        if not 0 <= local_index < len(self._page_rows):
+            return
+        if not 0 <= local_index - self._window_start < self._window_rows():
+            self._move_window(local_index)
+        item = str(local_index)
+        if self.tree.exists(item):
             self.tree.selection_set(item)
             self.tree.focus(item)
             self.tree.see(item)
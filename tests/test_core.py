@@ -1,14 +1,17 @@
 """Core logic tests for the Lazy CSV Viewer.
 
 Covers the parts that are easy to get subtly wrong: the cancelable search
-scan, the bounded row-count estimate, byte-offset paging (vs a full parse),
-the lazy filter index, the detail-view backing data, and config persistence.
+scan, the background page index, the bounded row-count estimate, byte-offset
+paging (vs a full parse), the lazy filter index, the detail-view backing data,
+and config persistence.
 
 Run with: python3 -m pytest    (requires tkinter + a display)
 """
 
 import csv
+import io
 import json
+import os
 import threading
 
 import main
@@ -69,6 +72,131 @@ def test_scan_no_header_counts_first_row_as_data(tmp_path):
     assert main.scan_for_match(path, "utf-8", ",", "zebra", False, 0) == 0
 
 
+# ---------------------------------------------------------------- page index
+
+
+def reader_page_offsets(path, has_header, page_size):
+    """Ground truth: page start offsets as seen by csv.reader + readline."""
+    size = os.path.getsize(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        ends = []
+
+        def lines():
+            while True:
+                line = f.readline()
+                if not line:
+                    return
+                ends.append(f.tell())
+                yield line
+
+        offsets = [] if has_header else [0]
+        rows = -1 if has_header else 0
+        for _ in csv.reader(lines()):
+            rows += 1
+            if rows % page_size == 0 and ends[-1] < size:
+                offsets.append(ends[-1])
+    return offsets
+
+
+def test_page_index_matches_reader(tmp_path, monkeypatch):
+    data = [
+        [
+            'quoted "" and\nnewline' if i % 7 == 0 else f"r{i}",
+            'a,"b' if i % 5 == 0 else "b",
+            "é" if i % 3 == 0 else "c",
+        ]
+        for i in range(95)
+    ]
+    path = write_csv(tmp_path / "f.csv", data)
+    # Tiny chunks make rows, quoted fields and "" escapes straddle chunk edges
+    for chunk in (1, 7, 64, main.INDEX_CHUNK):
+        monkeypatch.setattr(main, "INDEX_CHUNK", chunk)
+        for has_header in (True, False):
+            for page_size in (1, 10, 95, 100):
+                assert main.build_page_index(path, ",", has_header, page_size) == (
+                    reader_page_offsets(path, has_header, page_size)
+                ), (chunk, has_header, page_size)
+
+
+def test_parallel_page_index_matches_reader(tmp_path, monkeypatch):
+    plain = write_csv(tmp_path / "p.csv", [[f"r{i}", "b", "c"] for i in range(997)])
+    quoted = write_csv(
+        tmp_path / "q.csv", [["a\nb" if i == 500 else "x"] for i in range(997)]
+    )
+    monkeypatch.setattr(main, "PARALLEL_INDEX_MIN", 0)
+    monkeypatch.setattr(main, "INDEX_CHUNK", 100)
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 4)
+    for path in (plain, quoted):  # the quoted file falls back to the serial scan
+        assert main.build_page_index(path, ",", True, 10) == (
+            reader_page_offsets(path, True, 10)
+        )
+
+
+def test_read_page_block_matches_line_reads(tmp_path):
+    data = [[f"r{i}\nx" if i % 4 == 0 else f"r{i}", "b"] for i in range(30)]
+    path = write_csv(tmp_path / "f.csv", data, header=("A", "B", "C"))
+    offsets = main.build_page_index(path, ",", True, 10)
+    for page in range(3):
+        end = offsets[page + 1] if page + 1 < len(offsets) else None
+        line_read = main.read_page(path, "utf-8", ",", offsets[page], 10, 3)
+        block_read = main.read_page(path, "utf-8", ",", offsets[page], 10, 3, end)
+        expected = [row + [""] for row in data[page * 10 : (page + 1) * 10]]
+        assert block_read[0] == line_read[0] == expected
+        assert block_read[1:] == line_read[1:]
+
+
+def test_split_rows_matches_reader():
+    text = 'a,b\r\n\r\nc,"d\ne",f\r\ng,,\rh\n"i""j",k\n'
+    expected = list(csv.reader(io.StringIO(text, newline="")))
+    lines = iter(io.StringIO(text, newline="").readline, "")
+    assert list(main.split_rows(lines, ",")) == expected
+    plain = "a,b\r\n\r\nc,,d\n"
+    assert main._split_block(plain, ",") == [["a", "b"], [], ["c", "", "d"]]
+
+
+def test_page_index_cancel_and_bare_cr(tmp_path):
+    path = write_csv(tmp_path / "f.csv", [["a", "b", "c"]] * 10)
+    event = threading.Event()
+    event.set()
+    assert main.build_page_index(path, ",", True, 2, cancel_event=event) is None
+    cr = tmp_path / "cr.csv"
+    cr.write_bytes(b"A,B\ra,b\rc,d\r")
+    assert main.build_page_index(str(cr), ",", True, 1) is None
+
+
+# --------------------------------------------------------- delimiter fallback
+
+
+def test_guess_delimiter_prefers_consistent_counts():
+    lines = ["a b;c d;e", "f;g h i;j", "k;l;m"]
+    assert main.guess_delimiter(lines, [",", ";", " "]) == ";"
+    assert main.guess_delimiter(["a b c"] * 5, [",", ";", " "]) == " "
+    assert main.guess_delimiter(["a b c"] * 4, [",", ";", " "]) is None
+    assert main.guess_delimiter(["abc", "a,b"], [","]) is None
+
+
+def test_single_column_text_keeps_delimiter(app, tmp_path):
+    lines = ["full name", "John Smith", "Jane Mary Doe"]
+    assert main.guess_delimiter(lines, [",", ";", " "]) is None
+    path = tmp_path / "names.txt"
+    path.write_text("\n".join(lines) + "\n")
+    app._open_path(str(path))
+    assert app.delimiter == ","
+    assert tree_rows(app) == [["John Smith"], ["Jane Mary Doe"]]
+
+
+# ---------------------------------------------------------------- row builder
+
+
+def test_compiled_row_builder():
+    build = main.compile_row_builder([2, 0])
+    assert build([(0, ["a", "b", "c"]), (7, ["d", "e", "f"])]) == [
+        [1, "c", "a"],
+        [8, "f", "d"],
+    ]
+    assert main.compile_row_builder([])([(3, ["a"])]) == [[4]]
+
+
 # ----------------------------------------------------------------- estimate
 
 
@@ -109,6 +237,104 @@ def test_paging_matches_full_parse(app, tmp_path):
         assert tree_rows(app) == expected, f"page {page}"
 
 
+def test_next_page_uses_prefetch(app, tmp_path):
+    path = write_csv(tmp_path / "f.csv", [[f"r{i}", "b", "c"] for i in range(250)])
+    app.page_size = 100
+    app._open_path(path)
+    assert [k[0] for k in app._prefetch] == [1]  # page 2 parsed in the background
+    app.next_page()
+    assert tree_rows(app)[0] == ["r100", "b", "c"]
+    assert [k[0] for k in app._prefetch] == [2]
+    app.next_page()
+    assert len(tree_rows(app)) == 50 and not app.has_next_page
+    assert app._prefetch == {}
+
+
+def test_unchanged_page_is_not_rerendered(app, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "f.csv", [[f"r{i}", "b", "c"] for i in range(10)])
+    app._open_path(path)
+    calls = []
+    render = app._render_page
+    monkeypatch.setattr(app, "_render_page", lambda: calls.append(1) or render())
+    app._load_page()
+    app._reload_for_delimiter()
+    assert calls == []
+    app.hidden_columns.add(1)
+    app._load_page()
+    app.reload_file()
+    assert len(calls) == 2
+    assert tree_rows(app)[0] == ["r0", "c"]
+
+
+def test_delimiter_change_rebuilds_page_offsets(app, tmp_path):
+    data = [[f"b{i}", "multi\nline" if i % 3 == 0 else f"r{i}"] for i in range(30)]
+    path = tmp_path / "f.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f, delimiter=";").writerows([["A", "B"]] + data)
+    app.page_size = 10
+    app._open_path(str(path))
+    for index in (0, 2):  # mis-sniffed as comma, then corrected to semicolon
+        app.delimiter_dropdown.current(index)
+        app._on_delimiter_changed()
+        app._reload_for_delimiter()
+        app._index_future.result()
+        app._poll_index_queue()
+        app.next_page()
+    assert app.delimiter == ";"
+    assert tree_rows(app) == data[20:30]
+
+
+def test_page_turn_before_delimiter_reload_rescans_filter(app, tmp_path):
+    path = tmp_path / "f.csv"
+    path.write_text("A;B\n" + "".join(f"k{i};MATCH\n" for i in range(6)))
+    app.page_size = 2
+    app._open_path(str(path))
+    app.search_var.set("match")
+    app.filter_var.set(True)
+    app.toggle_filter()
+    app.delimiter_dropdown.current(0)
+    app._on_delimiter_changed()
+    app.next_page()  # lands inside the debounce, before _reload_for_delimiter
+    assert [row[0] for _, row in app.filter_matches] == [f"k{i};MATCH" for i in range(4)]
+
+
+def test_page_index_fills_offsets_from_pool(app, tmp_path):
+    path = write_csv(tmp_path / "f.csv", [[f"r{i}", "b", "c"] for i in range(250)])
+    app.page_size = 100
+    app._open_path(path)
+    app._index_future.result()
+    app._poll_index_queue()
+    assert sorted(app.page_offsets) == [0, 1, 2]
+    app._cancel_index()
+    assert app._index_future is None
+
+
+def test_expand_columns_resizes_without_reload(app, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "f.csv", [["x" * 100, "b", "c"]])
+    app._open_path(path)
+    fit_width = app.tree.column(0, "width")
+    reloads = []
+    monkeypatch.setattr(app, "_load_page", lambda: reloads.append(1))
+    app._toggle_expand_columns()
+    assert app.tree.column(0, "width") > fit_width
+    assert reloads == []
+
+
+def test_repaging_skips_unchanged_column_setup(app, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "f.csv", [[f"r{i:03}", "b", "c"] for i in range(300)])
+    app.page_size = 100
+    app._open_path(path)
+    calls = []
+    real_column = app.tree.column
+    monkeypatch.setattr(
+        app.tree, "column", lambda *a, **k: calls.append(a) or real_column(*a, **k)
+    )
+    monkeypatch.setattr(app.tree, "heading", lambda *a, **k: calls.append(a))
+    app.next_page()
+    assert tree_rows(app)[0] == ["r100", "b", "c"]
+    assert calls == []
+
+
 def test_go_to_row_selects(app, tmp_path):
     path = write_csv(tmp_path / "f.csv", [[f"r{i}", "b", "c"] for i in range(1000)])
     app.page_size = 100
@@ -120,6 +346,18 @@ def test_go_to_row_selects(app, tmp_path):
     assert selected and int(app.tree.item(selected[0], "values")[0]) == 333
 
 
+def test_large_page_is_windowed(app, tmp_path):
+    path = write_csv(tmp_path / "f.csv", [[f"r{i}", "b", "c"] for i in range(2000)])
+    app.page_size = 1200
+    app._open_path(path)
+    assert len(app.tree.get_children()) == app.ROW_WINDOW
+    app.row_var.set("1101")
+    app.go_to_row()  # outside the initial window: slides it, then selects
+    selected = app.tree.selection()
+    assert selected and int(app.tree.item(selected[0], "values")[0]) == 1101
+    assert app._page_full_rows[int(selected[0])] == ["r1100", "b", "c"]
+
+
 # ----------------------------------------------------------------- filter
 
 
@@ -169,6 +407,9 @@ def test_detail_keeps_hidden_columns(app, tmp_path):
     # Hidden Email is gone from the table but retained for the detail view
     assert tree_rows(app)[0] == ["n", "s"]
     assert app._page_full_rows[0] == ["n", "e", "s"]
+    app.hidden_columns = {0, 1}  # a single visible column
+    app._load_page()
+    assert tree_rows(app)[0] == ["s"]
 
 
 # ----------------------------------------------------------------- count worker